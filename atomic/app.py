@@ -1,7 +1,9 @@
+import argparse
 import calendar
 import json
 import os
-from datetime import date, datetime
+import urllib.error
+from datetime import date
 from pathlib import Path
 from typing import Any
 
@@ -9,13 +11,21 @@ from rich.text import Text
 from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical
+from textual.coordinate import Coordinate
 from textual.events import Click
 from textual.reactive import reactive
 from textual.screen import ModalScreen, Screen
 from textual.widget import Widget
 from textual.widgets import DataTable, Footer, Input, Label, OptionList
 
+from .utils._analytics import WEEKDAYS, HistoryMatrix
+from .utils._backup import BackupStore
+from .utils._lock import AppLock
 from .utils._logger import logger
+from .utils._models import Habit, HabitMonth, Profile
+from .utils._streaks import StreakIndex
+from .utils._sync import SyncServer, sync_profile
+from .utils._undo import CellEdit, RowEdit, UndoLog
 from .utils._validation import config_args
 
 
@@ -71,48 +81,19 @@ class EditCellScreen(ModalScreen):
         """If submitted the text, it will shown on DataTable."""
         main_screen = self.app.get_screen("main")
         self.table = main_screen.query_one(DataTable)
+        tracker = main_screen.query_one(TrackerContainer)
+        before = tracker._get_habit(self.table.cursor_row)
         self.table.update_cell_at(
             self.table.cursor_coordinate,
             event.value,
             update_width=True,
         )
-        self._save_data()
+        tracker._save_data()
+        tracker._cell_edited(self.table.cursor_coordinate, before)
         self.app.pop_screen()
         self.notify("Habit updated!")
         logger.info("Habit name updated.")
 
-    def _save_data(self):
-        current_month = datetime.now().strftime("%b")
-        current_year = datetime.now().strftime("%y")
-        current_profile_path = Path("data\\profiles.json")
-        try:
-            with current_profile_path.open("r", encoding="utf-8") as file:
-                self.current_profile_file = json.load(file)
-                self.current_profile = self.current_profile_file["current"]
-            self.data_file_path = Path(
-                "data\\"
-                + self.current_profile
-                + "\\"
-                + str(current_month)
-                + current_year
-                + ".json"
-            )
-            columns = [
-                col_metadata.label.plain for col_metadata in self.table.columns.values()
-            ]
-            rows = [self.table.get_row(row_key) for row_key in self.table.rows]
-            table_data = {}
-
-            for index, _ in enumerate(self.table.rows):
-                local_data_table = {}
-                table_data[(str(index + 1))] = local_data_table
-                for i in range(len(columns)):
-                    local_data_table[columns[i]] = rows[index][i]
-            with self.data_file_path.open("w", encoding="utf-8") as file:
-                json.dump(table_data, file, indent=4)
-        except Exception as e:
-            logger.error(e)
-
 
 class PriorityScreen(ModalScreen):
     BINDINGS = [("escape", "app.pop_screen", "Close the screen")]
@@ -164,49 +145,17 @@ class PriorityScreen(ModalScreen):
 
         main_screen = self.app.get_screen("main")
         self.table = main_screen.query_one(DataTable)
+        tracker = main_screen.query_one(TrackerContainer)
+        before = tracker._get_habit(self.table.cursor_row)
         self.table.update_cell_at(
             self.table.cursor_coordinate,
             event.option.prompt,
             update_width=True,
         )
-        try:
-            self._save_data()
-        except Exception as e:
-            logger.error(e)
+        tracker._save_data()
+        tracker._cell_edited(self.table.cursor_coordinate, before)
         self.app.pop_screen()
 
-    def _save_data(self):
-        current_month = datetime.now().strftime("%b")
-        current_year = datetime.now().strftime("%y")
-        current_profile_path = Path("data\\profiles.json")
-        try:
-            with current_profile_path.open("r", encoding="utf-8") as file:
-                self.current_profile_file = json.load(file)
-                self.current_profile = self.current_profile_file["current"]
-            self.data_file_path = Path(
-                "data\\"
-                + self.current_profile
-                + "\\"
-                + str(current_month)
-                + current_year
-                + ".json"
-            )
-            columns = [
-                col_metadata.label.plain for col_metadata in self.table.columns.values()
-            ]
-            rows = [self.table.get_row(row_key) for row_key in self.table.rows]
-            table_data = {}
-
-            for index, _ in enumerate(self.table.rows):
-                local_data_table = {}
-                table_data[(str(index + 1))] = local_data_table
-                for i in range(len(columns)):
-                    local_data_table[columns[i]] = rows[index][i]
-            with self.data_file_path.open("w", encoding="utf-8") as file:
-                json.dump(table_data, file, indent=4)
-        except Exception as e:
-            logger.error(e)
-
 
 class HelpScreen(ModalScreen[None]):
     BINDINGS = [("escape", "app.pop_screen", "Close the screen")]
@@ -242,9 +191,93 @@ class HelpScreen(ModalScreen[None]):
                 "You can choose difficulty of the habit from 'Prio' column.\n* Different levels will give you 1/2/3 experience points."
             )
             yield Label("You can mark/unmark habits from day columns.")
+            yield Label("You can undo your last edits with `u` and redo them with `U`.")
+            yield Label("You can back up your data with `b`.")
             yield Label(
                 "You can start gaining 'Gold' by marking at least three consecutive days.\n* Different levels will give you 5/10/15 gold."
             )
+            yield Label(
+                "Streaks are tracked per habit name and continue across months."
+            )
+
+
+class AnalyticsScreen(ModalScreen[None]):
+    BINDINGS = [
+        ("escape", "app.pop_screen", "Close the screen"),
+        ("left", "previous_year", "Previous year"),
+        ("right", "next_year", "Next year"),
+    ]
+
+    DEFAULT_CSS = """
+    AnalyticsScreen {
+        align: center middle;
+    }
+
+    #analytics-screen-container {
+        width: auto;
+        max-width: 90%;
+        height: auto;
+        max-height: 90%;
+        background: $panel;
+        padding: 1 2;
+        border: thick $primary;
+
+        & > Horizontal {
+            width: auto;
+            height: auto;
+        }
+        & > Horizontal > Label {
+            margin-right: 4;
+        }
+    }
+    """
+    year = reactive(date.today().year, recompose=True)
+
+    def __init__(self, profile_dir: Path) -> None:
+        super().__init__()
+        self.profile_dir = profile_dir
+
+    def compose(self) -> ComposeResult:
+        history = HistoryMatrix.load(self.profile_dir, self.year)
+        with Vertical(id="analytics-screen-container"):
+            yield Label(
+                Text(
+                    f"{self.year} - Press left/right to change year, ESC to exit.\n",
+                    style="italic",
+                )
+            )
+            yield Label(self._heatmap(history.daily_counts(), len(history.habits)))
+            with Horizontal():
+                yield Label(self._rates("Habit", history.habit_rates()))
+                yield Label(self._rates("Weekday", history.weekday_rates()))
+                yield Label(self._rates("Prio", history.priority_rates()))
+
+    def action_previous_year(self) -> None:
+        self.year -= 1
+
+    def action_next_year(self) -> None:
+        self.year += 1
+
+    def _heatmap(self, daily_counts: list[tuple[date, int]], habits: int) -> Text:
+        """GitHub style heatmap, one column per week and one row per weekday."""
+        shades = "·░▒▓█"
+        offset = daily_counts[0][0].weekday()
+        weeks = (offset + len(daily_counts) + 6) // 7
+        grid = [[" "] * weeks for _ in range(7)]
+        for index, (_, count) in enumerate(daily_counts):
+            level = -(-count * 4 // habits) if habits else 0
+            grid[(offset + index) % 7][(offset + index) // 7] = shades[min(level, 4)]
+
+        heatmap = Text(style=config_args.colors["default_text"])
+        for weekday, cells in zip(WEEKDAYS, grid):
+            heatmap.append(f"{weekday} {''.join(cells)}\n")
+        return heatmap
+
+    def _rates(self, title: str, rates: dict[str, float]) -> Text:
+        text = Text(f"{title}\n", style="bold")
+        for name, rate in rates.items():
+            text.append(f"{name[:16]:<16} {rate:>4.0%}\n")
+        return text
 
 
 class SidebarWidget(Widget):
@@ -278,6 +311,7 @@ class SidebarWidget(Widget):
     current_level = reactive("0", recompose=True)
     current_experience = reactive("0", recompose=True)
     current_gold = reactive("0", recompose=True)
+    current_streaks = reactive("", recompose=True)
 
     def compose(self) -> ComposeResult:
         self._get_data()
@@ -295,6 +329,8 @@ class SidebarWidget(Widget):
                 f"Experience: {self.current_experience}/{config_args.experience[int(self.current_level) - 1]}"
             )
             yield Label(f"Gold: {self.current_gold}")
+            yield Label(Text("\nStreaks", style="italic"))
+            yield Label(self.current_streaks or "-")
 
     def on_mount(self) -> None:
         """Mounting refresher for data."""
@@ -302,52 +338,23 @@ class SidebarWidget(Widget):
 
     def _get_data(self):
         """Pull data from the JSON files."""
-        current_month = datetime.now().strftime("%b")
-        current_year = datetime.now().strftime("%y")
         self.profiles_path = Path("data\\profiles.json")
         try:
             with self.profiles_path.open("r", encoding="utf-8") as file:
                 self.profiles_file = json.load(file)
                 self.current_profile = self.profiles_file["current"]
 
-            self.data_file_path = Path(
-                "data\\"
-                + self.current_profile
-                + "\\"
-                + str(current_month)
-                + current_year
-                + ".json"
-            )
-            with self.data_file_path.open("r", encoding="utf-8") as file:
-                self.data_file = json.load(file)
-
-            if not self.profiles_file["profiles"].get(self.current_profile):
-                self.profile_title = config_args.titles[0]
-                self.profile_level = 1
-                self.profile_experience = 0
-                self.profile_gold = 0
-
-                self.profiles_file["profiles"][self.current_profile] = {
-                    "title": self.profile_title,
-                    "level": self.profile_level,
-                    "experience": self.profile_experience,
-                    "gold": self.profile_gold,
-                }
+            self.data_file_path = self.app.data_file_path
+            profile_data = self.profiles_file["profiles"].get(self.current_profile)
+            if not profile_data:
+                self.profile = Profile(self.current_profile, config_args.titles[0])
+                self.profiles_file["profiles"][self.current_profile] = (
+                    self.profile.to_dict()
+                )
                 with self.profiles_path.open("w", encoding="utf-8") as file:
                     json.dump(self.profiles_file, file, indent=4)
             else:
-                self.profile_level = self.profiles_file["profiles"][
-                    self.current_profile
-                ]["title"]
-                self.profile_level = self.profiles_file["profiles"][
-                    self.current_profile
-                ]["level"]
-                self.profile_experience = self.profiles_file["profiles"][
-                    self.current_profile
-                ]["experience"]
-                self.profile_experience = self.profiles_file["profiles"][
-                    self.current_profile
-                ]["gold"]
+                self.profile = Profile.from_dict(self.current_profile, profile_data)
 
         except Exception as e:
             logger.error(e)
@@ -355,64 +362,50 @@ class SidebarWidget(Widget):
     def _calculate_stats(self):
         """Calculate and save title, level, experience and gold."""
         # Read current state
-        with self.data_file_path.open("r", encoding="utf-8") as file:
-            self.data_file = json.load(file)
+        today = date.today()
+        month = HabitMonth.load(self.data_file_path, self.app.month_start)
 
         # Calculate current experience and level
         total_level = 0
-        total_experience = 0
-        for _, values in self.data_file.items():
-            if "Low" in values.values():
-                for value in values.values():
-                    if value == "X":
-                        total_experience += 1
-            elif "Medium" in values.values():
-                for value in values.values():
-                    if value == "X":
-                        total_experience += 2
-
-            elif "High" in values.values():
-                for value in values.values():
-                    if value == "X":
-                        total_experience += 3
-            else:
-                for value in values.values():
-                    if value == "X":
-                        total_experience += 1
+        total_experience = month.experience()
 
         for i, experience in enumerate(config_args.experience, start=1):
             if total_experience < experience:
                 total_level = i
                 break
 
-        # Calculate current gold
+        # Calculate current gold and streaks
+        first_day = month.start
+        last_day = month.start.replace(day=month.days)
+        streak_index = self.app.streak_index
+        habits = {}
+        for habit in month.habits:
+            if habit.key is not None and habit.key not in habits:
+                habits[habit.key] = habit.priority.weight
+
         total_gold = 0
-        for row in self.data_file:
-            streaks = list(self.data_file[row].values())
-            streak_count = list(zip(streaks, streaks[1:], streaks[2:])).count(
-                ("X", "X", "X")
-            )
-            if "Low" in streaks:
-                total_gold += 5 * 1 * streak_count
-            elif "Medium" in streaks:
-                total_gold += 5 * 2 * streak_count
-            elif "High" in streaks:
-                total_gold += 5 * 3 * streak_count
-            else:
-                total_gold += 5 * 1 * streak_count
+        for habit, weight in habits.items():
+            total_gold += 5 * weight * streak_index.triples(habit, first_day, last_day)
+
+        streaks = sorted(
+            (
+                (streak_index.current(habit, today), streak_index.longest(habit), habit)
+                for habit in habits
+            ),
+            reverse=True,
+        )
+        current_streaks = "\n".join(
+            f"{habit[:14]}: {current}d (best {longest}d)"
+            for current, longest, habit in streaks[:5]
+        )
 
         # Dump data
-        self.profile_title = config_args.titles[total_level - 1]
-        self.profile_level = total_level
-        self.profile_experience = total_experience
-        self.profile_gold = total_gold
-
-        self.profiles_file["profiles"][self.current_profile] = {
-            "title": self.profile_title,
-            "level": self.profile_level,
-            "experience": self.profile_experience,
-            "gold": self.profile_gold,
-        }
+        self.profile.title = config_args.titles[total_level - 1]
+        self.profile.level = total_level
+        self.profile.experience = total_experience
+        self.profile.gold = total_gold
+
+        self.profiles_file["profiles"][self.current_profile] = self.profile.to_dict()
         try:
             with self.profiles_path.open("w", encoding="utf-8") as file:
                 json.dump(self.profiles_file, file, indent=4)
@@ -420,18 +413,23 @@ class SidebarWidget(Widget):
             logger.error(e)
 
         # Update shown experience
-        self.current_title = self.profile_title
-        self.current_level = self.profile_level
-        self.current_experience = self.profile_experience
-        self.current_gold = self.profile_gold
+        self.current_title = self.profile.title
+        self.current_level = self.profile.level
+        self.current_experience = self.profile.experience
+        self.current_gold = self.profile.gold
+        self.current_streaks = current_streaks
 
 
 class TrackerContainer(Horizontal):
     BINDINGS = [
         ("a", "add_habit", "Add habit"),
         ("r", "remove_habit", "Remove habit"),
+        ("u", "undo", "Undo"),
+        ("U", "redo", "Redo"),
         ("s", "toggle_sidebar", "Show profile"),
         ("h", "show_help", "Help"),
+        ("y", "show_analytics", "Analytics"),
+        ("b", "backup", "Backup"),
     ]
     DEFAULT_CSS = """
         TrackerContainer {
@@ -470,17 +468,20 @@ class TrackerContainer(Horizontal):
             elif event.coordinate.column == 1:
                 self.app.push_screen(PriorityScreen(cell_value))
             else:
+                before = self._get_habit(event.coordinate.row)
                 cell_value = "" if event.value == "X" else "X"
                 self.table.update_cell(
                     event.cell_key.row_key, event.cell_key.column_key, cell_value
                 )
+                self._cell_edited(event.coordinate, before)
             self._save_data()
         except Exception as e:
             logger.error(e)
 
     def _setup_table(self):
+        month_start = self.app.month_start
         today = date.today()
-        days_count = calendar.monthrange(today.year, today.month)[1]
+        days_count = calendar.monthrange(month_start.year, month_start.month)[1]
         self.table.add_column(
             Text("Habit", style=config_args.colors["default_text"]), width=30
         )
@@ -488,10 +489,10 @@ class TrackerContainer(Horizontal):
             Text("Prio", style=config_args.colors["default_text"]), width=4
         )
         for day in range(1, days_count + 1):
-            if day == today.day:
+            if month_start.replace(day=day) == today:
                 self.table.add_column(
                     Text(
-                        f"{datetime(today.year, today.month, day).strftime('%a')} {str(day)}",
+                        f"{month_start.replace(day=day).strftime('%a')} {str(day)}",
                         style=config_args.colors["today"],
                         overflow="fold",
                     ),
@@ -500,7 +501,7 @@ class TrackerContainer(Horizontal):
             else:
                 self.table.add_column(
                     Text(
-                        f"{datetime(today.year, today.month, day).strftime('%a')} {str(day)}",
+                        f"{month_start.replace(day=day).strftime('%a')} {str(day)}",
                         style=config_args.colors["default_text"],
                         overflow="fold",
                     ),
@@ -510,8 +511,6 @@ class TrackerContainer(Horizontal):
 
     def _load_data(self):
         # Profiles file
-        current_month = datetime.now().strftime("%b")
-        current_year = datetime.now().strftime("%y")
         current_profile_path = Path("data\\profiles.json")
         with current_profile_path.open("r", encoding="utf-8") as file:
             self.current_profile_file = json.load(file)
@@ -519,37 +518,95 @@ class TrackerContainer(Horizontal):
 
         # Data file
         try:
-            self.data_file_path = Path(
-                "data\\"
-                + self.current_profile
-                + "\\"
-                + str(current_month)
-                + current_year
-                + ".json"
-            )
-            with self.data_file_path.open("r", encoding="utf-8") as file:
-                for _, values in json.load(file).items():
-                    self.table.add_row(*values.values())
+            self.data_file_path = self.app.data_file_path
+            self.month_start = self.app.month_start
+            month = HabitMonth.load(self.data_file_path, self.month_start)
+            for habit in month.habits:
+                self.table.add_row(*habit.to_cells(month.days))
             logger.info("Table loaded succesfully.")
         except Exception as e:
             logger.error(e)
 
-    def _save_data(self):
-        columns = [
-            col_metadata.label.plain for col_metadata in self.table.columns.values()
-        ]
-        rows = [self.table.get_row(row_key) for row_key in self.table.rows]
-        table_data = {}
-
-        for index, _ in enumerate(self.table.rows):
-            local_data_table = {}
-            table_data[(str(index + 1))] = local_data_table
-            for i in range(len(columns)):
-                local_data_table[columns[i]] = rows[index][i]
+    def _get_habit(self, row_index: int) -> Habit:
+        return Habit.from_cells(self.table.get_row_at(row_index))
+
+    def _cell_edited(self, coordinate: Coordinate, before: Habit) -> None:
+        """Record a changed cell for undo and apply it to the streak index."""
+        after = self._get_habit(coordinate.row)
+        days = len(self.table.columns) - 2
+        self.app.undo_log.record(
+            CellEdit(
+                coordinate.row,
+                coordinate.column,
+                before.to_cells(days)[coordinate.column],
+                after.to_cells(days)[coordinate.column],
+            )
+        )
+        self._update_streaks(before, after)
+
+    def _update_streaks(self, before: Habit, after: Habit) -> None:
+        """
+        Apply the difference between two versions of a habit to the streak index.
+        Called after the table changed, so days another row of the same habit still marks are kept.
+        """
+        old_habit, new_habit = before.key, after.key
+        old_days, new_days = set(before.marked_days()), set(after.marked_days())
+        if old_habit == new_habit:
+            old_days, new_days = old_days - new_days, new_days - old_days
+        if old_days and old_habit is not None:
+            for row_index in range(self.table.row_count):
+                habit = self._get_habit(row_index)
+                if habit.key == old_habit:
+                    old_days -= set(habit.marked_days())
+        if not old_days and not new_days:
+            return
+        for day in old_days:
+            self.app.streak_index.mark(
+                old_habit, self.month_start.replace(day=day), False
+            )
+        for day in new_days:
+            self.app.streak_index.mark(
+                new_habit, self.month_start.replace(day=day), True
+            )
+        self.app.streak_index.save()
+
+    def _insert_row(self, row_index: int, values: list[Any]) -> None:
+        """Insert a row at a position by re-adding the rows below it."""
+        below = []
+        while self.table.row_count > row_index:
+            row_key, _ = self.table.coordinate_to_cell_key(Coordinate(row_index, 0))
+            below.append(self.table.get_row(row_key))
+            self.table.remove_row(row_key)
+        self.table.add_row(*values)
+        for row in below:
+            self.table.add_row(*row)
+
+    def _apply_edit(self, edit: CellEdit | RowEdit) -> None:
+        """Apply a single undo/redo step to the table and persist it."""
+        if isinstance(edit, CellEdit):
+            before = self._get_habit(edit.row)
+            self.table.update_cell_at(
+                Coordinate(edit.row, edit.column), edit.after, update_width=True
+            )
+            self.table.move_cursor(row=edit.row, column=edit.column)
+            self._update_streaks(before, self._get_habit(edit.row))
+        elif edit.inserted:
+            self._insert_row(edit.row, edit.values)
+            self._update_streaks(Habit(), self._get_habit(edit.row))
+        else:
+            before = self._get_habit(edit.row)
+            row_key, _ = self.table.coordinate_to_cell_key(Coordinate(edit.row, 0))
+            self.table.remove_row(row_key)
+            self._update_streaks(before, Habit())
+        self._save_data()
 
+    def _save_data(self):
+        month = HabitMonth(
+            self.month_start,
+            [self._get_habit(row_index) for row_index in range(self.table.row_count)],
+        )
         try:
-            with self.data_file_path.open("w", encoding="utf-8") as file:
-                json.dump(table_data, file, indent=4)
+            month.save(self.data_file_path)
         except Exception as e:
             logger.error(e)
 
@@ -557,20 +614,52 @@ class TrackerContainer(Horizontal):
         """Adds new row."""
         empty_days = [""] * (len(self.table.columns))
         self.table.add_row(*empty_days)
+        self.app.undo_log.record(RowEdit(self.table.row_count - 1, empty_days, True))
         self._save_data()
         self.notify("New row added!")
 
     def action_remove_habit(self):
         """Removes the selected row."""
         row_key, _ = self.table.coordinate_to_cell_key(self.table.cursor_coordinate)
+        habit = self._get_habit(self.table.cursor_row)
+        self.app.undo_log.record(
+            RowEdit(self.table.cursor_row, list(self.table.get_row(row_key)), False)
+        )
         self.table.remove_row(row_key)
+        self._update_streaks(habit, Habit())
         self._save_data()
         self.notify("Selected row deleted!")
 
+    def action_undo(self):
+        """Reverts the latest table edit."""
+        edit = self.app.undo_log.undo()
+        if edit is None:
+            self.notify("Nothing to undo!")
+            return
+        self._apply_edit(edit)
+        self.notify("Edit undone!")
+
+    def action_redo(self):
+        """Applies the latest undone table edit again."""
+        edit = self.app.undo_log.redo()
+        if edit is None:
+            self.notify("Nothing to redo!")
+            return
+        self._apply_edit(edit)
+        self.notify("Edit redone!")
+
     def action_show_help(self):
         """Shows the HelpScreen."""
         self.app.push_screen(HelpScreen())
 
+    def action_show_analytics(self):
+        """Shows the AnalyticsScreen."""
+        self.app.push_screen(AnalyticsScreen(self.app.profile_folder_path))
+
+    def action_backup(self):
+        """Takes a backup snapshot of the data folder."""
+        self.app.backup_data(notify=True)
+
     def action_toggle_sidebar(self) -> None:
         """Toggle the sidebar visibility."""
         self.show_sidebar = not self.show_sidebar
@@ -643,6 +732,26 @@ class AtomicApp(App):
     def on_mount(self) -> None:
         """Mounting Profile Name screen."""
         self.profile_files_creation()
+        if config_args.backup_interval:
+            self.set_interval(config_args.backup_interval * 60, self.backup_data)
+
+    @work(thread=True, exclusive=True, group="backup")
+    def backup_data(self, notify: bool = False) -> None:
+        """Snapshot the data folder and prune old snapshots in a background thread."""
+        try:
+            backups = BackupStore(Path("data"), Path("backups"))
+            snapshot = backups.create()
+            backups.prune(config_args.backup_keep)
+        except Exception as e:
+            logger.error(e)
+            return
+        if notify:
+            self.call_from_thread(
+                self.notify,
+                f"Backup {snapshot} created!"
+                if snapshot
+                else "Nothing changed since the last backup.",
+            )
 
     @work
     async def profile_files_creation(self):
@@ -651,9 +760,9 @@ class AtomicApp(App):
         # Get profile name and create folder if not exist
         self.profile_name: str = await self.push_screen_wait("profile")
         self.profile_name = self.profile_name.strip().casefold()
-        profile_folder_path = Path(f"data\\{self.profile_name}")
-        if not profile_folder_path.exists():
-            os.makedirs(profile_folder_path)
+        self.profile_folder_path = Path(f"data\\{self.profile_name}")
+        if not self.profile_folder_path.exists():
+            os.makedirs(self.profile_folder_path)
 
         # Create or update current section of profiles.json
         try:
@@ -674,8 +783,10 @@ class AtomicApp(App):
         except Exception as e:
             logger.error(e)
 
-        current_month = datetime.now().strftime("%b")
-        current_year = datetime.now().strftime("%y")
+        # The month is fixed for the session, so edits after midnight on the last day still go to it
+        self.month_start = date.today().replace(day=1)
+        current_month = self.month_start.strftime("%b")
+        current_year = self.month_start.strftime("%y")
         self.data_file_path = Path(
             "data\\"
             + self.profile_name
@@ -689,6 +800,10 @@ class AtomicApp(App):
             with self.data_file_path.open("w", encoding="utf-8") as file:
                 json.dump(data, file, indent=4)
 
+        # Load the streak index covering the whole profile history
+        self.streak_index = StreakIndex.open(self.profile_folder_path)
+        self.undo_log = UndoLog(config_args.undo_limit)
+
         # Push the main screen
         if self.profile_name:
             self.notify(f"Loaded profile: {self.profile_name}")
@@ -696,8 +811,82 @@ class AtomicApp(App):
 
 
 def run():
-    app = AtomicApp()
-    app.run()
+    parser = argparse.ArgumentParser(prog="atomic", description="Habit Tracker App")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("backup", help="snapshot the data folder")
+    commands.add_parser("snapshots", help="list backup snapshots")
+    restore_parser = commands.add_parser("restore", help="restore a backup snapshot")
+    restore_parser.add_argument(
+        "point", help="snapshot name or prefix, e.g. 20251104 or 20251104-13"
+    )
+    prune_parser = commands.add_parser("prune", help="remove old backup snapshots")
+    prune_parser.add_argument("--keep", type=int, default=config_args.backup_keep)
+    sync_parser = commands.add_parser("sync", help="sync a profile with a sync server")
+    sync_parser.add_argument("server", help="server url, e.g. http://localhost:8765")
+    sync_parser.add_argument(
+        "--profile", help="profile name, defaults to the current one"
+    )
+    serve_parser = commands.add_parser("serve", help="run the reference sync server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--store", type=Path, default=Path("sync_server.json"))
+    args = parser.parse_args()
+    if args.command == "prune" and args.keep < 1:
+        parser.error("--keep must be at least 1")
+
+    # Commands touching the data folder or the backups wait until the app is closed.
+    lock = AppLock()
+    if args.command not in ("snapshots", "serve") and not lock.acquire():
+        print(
+            f"Close the app before running `{args.command}`."
+            if args.command
+            else "The app is already running."
+        )
+        return
+
+    backups = BackupStore(Path("data"), Path("backups"))
+    try:
+        if args.command == "backup":
+            snapshot = backups.create()
+            print(snapshot or "Nothing changed since the last backup.")
+        elif args.command == "snapshots":
+            print("\n".join(backups.snapshots()))
+        elif args.command == "restore":
+            try:
+                snapshot = backups.restore(args.point)
+            except (ValueError, OSError) as e:
+                print(f"Restore failed: {e}")
+                return
+            print(f"Restored {snapshot}." if snapshot else "No snapshot found.")
+        elif args.command == "prune":
+            print(f"Removed {backups.prune(args.keep)} snapshots.")
+        elif args.command == "sync":
+            try:
+                profile = args.profile
+                if profile is None:
+                    with Path("data\\profiles.json").open(
+                        "r", encoding="utf-8"
+                    ) as file:
+                        profile = json.load(file)["current"]
+                profile_dir = Path(f"data\\{profile}")
+                if not profile_dir.is_dir():
+                    raise FileNotFoundError(f"No data folder for profile {profile}")
+                pushed, pulled = sync_profile(
+                    profile_dir, Path(f"sync\\{profile}.json"), args.server, profile
+                )
+            except (urllib.error.URLError, OSError) as e:
+                print(f"Sync failed: {e}")
+                return
+            print(f"Synced {profile}: {pushed} changes pushed, {pulled} pulled.")
+        elif args.command == "serve":
+            server = SyncServer((args.host, args.port), args.store)
+            print(f"Sync server listening on http://{args.host}:{args.port}")
+            server.serve_forever()
+        else:
+            app = AtomicApp()
+            app.run()
+    finally:
+        lock.release()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import calendar
+from datetime import date, timedelta
+from pathlib import Path
+
+from ._history import month_files
+from ._models import HabitMonth, Priority
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PRIORITIES = (Priority.LOW, Priority.MEDIUM, Priority.HIGH)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class HistoryMatrix:
+    """
+    Dense habit x day view of a profile's month files.
+
+    `done` marks completed days and `tracked` the days a habit had a row in its month file,
+    up to today. Aggregates use NumPy when it is installed and plain Python otherwise.
+    """
+
+    def __init__(
+        self,
+        first_day: date,
+        days: int,
+        habits: list[str],
+        priorities: list[Priority],
+        done: list[bytearray],
+        tracked: list[bytearray],
+    ) -> None:
+        self.first_day = first_day
+        self.days = days
+        self.habits = habits
+        self.priorities = priorities
+        if np is not None:
+            shape = (len(habits), days)
+            self.done = np.frombuffer(b"".join(done), dtype=bool).reshape(shape)
+            self.tracked = np.frombuffer(b"".join(tracked), dtype=bool).reshape(shape)
+        else:
+            self.done = done
+            self.tracked = tracked
+
+    @classmethod
+    def load(cls, profile_dir: Path, year: int | None = None) -> "HistoryMatrix":
+        """Read the month files of one year, or of the full history if `year` is None."""
+        months = [
+            (start, path)
+            for start, path in month_files(profile_dir)
+            if year is None or start.year == year
+        ]
+        if year is not None:
+            first_day, last_day = date(year, 1, 1), date(year, 12, 31)
+        elif months:
+            first_day = months[0][0]
+            last = months[-1][0]
+            last_day = last.replace(day=calendar.monthrange(last.year, last.month)[1])
+        else:
+            first_day = last_day = date.today()
+        days = (last_day - first_day).days + 1
+        today = (date.today() - first_day).days
+
+        rows: dict[str, int] = {}
+        habits, priorities, done, tracked = [], [], [], []
+        for start, path in months:
+            offset = (start - first_day).days
+            month = HabitMonth.load(path, start)
+            for habit in month.habits:
+                if habit.key is None:
+                    continue
+                if habit.key not in rows:
+                    rows[habit.key] = len(habits)
+                    habits.append(habit.key)
+                    priorities.append(Priority.NONE)
+                    done.append(bytearray(days))
+                    tracked.append(bytearray(days))
+                index = rows[habit.key]
+                if habit.priority is not Priority.NONE:
+                    priorities[index] = habit.priority
+                end = min(offset + month.days, today + 1)
+                if end > offset:
+                    tracked[index][offset:end] = b"\x01" * (end - offset)
+                for day in habit.marked_days():
+                    # Days marked ahead of today are not tracked yet and don't count.
+                    if day <= month.days and offset + day - 1 <= today:
+                        done[index][offset + day - 1] = 1
+        return cls(first_day, days, habits, priorities, done, tracked)
+
+    def habit_rates(self) -> dict[str, float]:
+        """Completion rate of every habit over its tracked days."""
+        if np is not None:
+            done = self.done.sum(axis=1)
+            tracked = self.tracked.sum(axis=1)
+        else:
+            done = [sum(row) for row in self.done]
+            tracked = [sum(row) for row in self.tracked]
+        return {
+            habit: _rate(done[i], tracked[i]) for i, habit in enumerate(self.habits)
+        }
+
+    def weekday_rates(self) -> dict[str, float]:
+        """Completion rate per weekday, Monday first."""
+        done, tracked = self._daily_sums()
+        offset = self.first_day.weekday()
+        if np is not None:
+            weekdays = (np.arange(self.days) + offset) % 7
+            done = np.bincount(weekdays, weights=done, minlength=7)
+            tracked = np.bincount(weekdays, weights=tracked, minlength=7)
+        else:
+            done_by_day, tracked_by_day = [0] * 7, [0] * 7
+            for day in range(self.days):
+                done_by_day[(day + offset) % 7] += done[day]
+                tracked_by_day[(day + offset) % 7] += tracked[day]
+            done, tracked = done_by_day, tracked_by_day
+        return {name: _rate(done[i], tracked[i]) for i, name in enumerate(WEEKDAYS)}
+
+    def priority_rates(self) -> dict[str, float]:
+        """Completion rate per priority level. Habits without a priority count as `Low`."""
+        levels = [
+            PRIORITIES.index(prio) if prio in PRIORITIES else 0
+            for prio in self.priorities
+        ]
+        if np is not None and self.habits:
+            done = np.bincount(levels, weights=self.done.sum(axis=1), minlength=3)
+            tracked = np.bincount(levels, weights=self.tracked.sum(axis=1), minlength=3)
+        else:
+            done, tracked = [0] * 3, [0] * 3
+            for i, level in enumerate(levels):
+                done[level] += sum(self.done[i])
+                tracked[level] += sum(self.tracked[i])
+        return {
+            prio.value: _rate(done[i], tracked[i]) for i, prio in enumerate(PRIORITIES)
+        }
+
+    def daily_counts(self) -> list[tuple[date, int]]:
+        """Number of completed habits on every day of the range."""
+        done, _ = self._daily_sums()
+        return [
+            (self.first_day + timedelta(days=day), int(done[day]))
+            for day in range(self.days)
+        ]
+
+    def _daily_sums(self):
+        if np is not None:
+            if not self.habits:
+                return np.zeros(self.days), np.zeros(self.days)
+            return self.done.sum(axis=0), self.tracked.sum(axis=0)
+        done, tracked = [0] * self.days, [0] * self.days
+        for row in self.done:
+            for day, value in enumerate(row):
+                done[day] += value
+        for row in self.tracked:
+            for day, value in enumerate(row):
+                tracked[day] += value
+        return done, tracked
+
+
+def _rate(done, tracked) -> float:
+    return float(done) / float(tracked) if tracked else 0.0
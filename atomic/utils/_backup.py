@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from ._logger import logger
+
+SNAPSHOT_FORMAT = "%Y%m%d-%H%M%S"
+# A full or partial snapshot name, e.g. `2025`, `20251104` or `20251104-13`.
+SNAPSHOT_POINT = re.compile(r"\d{1,8}|\d{8}-\d{0,6}")
+
+
+class BackupStore:
+    """
+    Incremental backups of the data folder.
+
+    File contents are stored once under `objects/`, compressed and named by their SHA-256 hash.
+    Each snapshot under `snapshots/` only maps relative paths to those hashes.
+    """
+
+    def __init__(self, data_dir: Path, backup_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.objects_dir = backup_dir / "objects"
+        self.snapshots_dir = backup_dir / "snapshots"
+
+    def snapshots(self) -> list[str]:
+        """Snapshot names, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted(path.stem for path in self.snapshots_dir.glob("*.json"))
+
+    def read_snapshot(self, name: str) -> dict[str, dict]:
+        with (self.snapshots_dir / f"{name}.json").open("r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def create(self) -> str | None:
+        """
+        Snapshot the data folder. Files whose size and modification time match the latest
+        snapshot are not read again, and nothing is written if no file changed.
+        """
+        if not self.data_dir.exists():
+            return None
+        snapshots = self.snapshots()
+        previous = self.read_snapshot(snapshots[-1]) if snapshots else {}
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+        manifest = {}
+        for path in sorted(self.data_dir.rglob("*")):
+            if not path.is_file():
+                continue
+            name = path.relative_to(self.data_dir).as_posix()
+            stat = path.stat()
+            entry = previous.get(name)
+            if entry and (entry["size"], entry["mtime"]) == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                manifest[name] = entry
+                continue
+
+            content = path.read_bytes()
+            if path.suffix == ".json" and not _is_json(content):
+                # Caught in the middle of a write, keep the last good version.
+                logger.error(f"Skipped half written file: {name}")
+                if entry:
+                    manifest[name] = entry
+                continue
+            digest = hashlib.sha256(content).hexdigest()
+            self._write_object(digest, content)
+            manifest[name] = {
+                "hash": digest,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+            }
+
+        if snapshots and _hashes(manifest) == _hashes(previous):
+            return None
+        snapshot = datetime.now().strftime(SNAPSHOT_FORMAT)
+        with (self.snapshots_dir / f"{snapshot}.json").open(
+            "w", encoding="utf-8"
+        ) as file:
+            json.dump(manifest, file, indent=4)
+        logger.info(f"Backup snapshot {snapshot} created.")
+        return snapshot
+
+    def restore(self, point: str) -> str | None:
+        """
+        Restore the latest snapshot taken at or before `point` (a full or partial snapshot name,
+        e.g. `20251104` or `20251104-13`). The current state is snapshotted first.
+        Raises `ValueError` for a malformed point and `FileNotFoundError` if the snapshot is incomplete.
+        """
+        if not SNAPSHOT_POINT.fullmatch(point):
+            raise ValueError(f"Invalid snapshot point: {point}")
+        matches = [name for name in self.snapshots() if name[: len(point)] <= point]
+        if not matches:
+            return None
+        snapshot = matches[-1]
+        manifest = self.read_snapshot(snapshot)
+        for name, entry in manifest.items():
+            if not (self.objects_dir / entry["hash"]).exists():
+                raise FileNotFoundError(f"Snapshot {snapshot} is missing {name}")
+        self.create()
+
+        for name, entry in manifest.items():
+            path = self.data_dir / name
+            os.makedirs(path.parent, exist_ok=True)
+            path.write_bytes(self._read_object(entry["hash"]))
+        for path in self.data_dir.rglob("*"):
+            if (
+                path.is_file()
+                and path.relative_to(self.data_dir).as_posix() not in manifest
+            ):
+                path.unlink()
+        logger.info(f"Backup snapshot {snapshot} restored.")
+        return snapshot
+
+    def prune(self, keep: int) -> int:
+        """Drop all but the `keep` newest snapshots and the objects only they used."""
+        if keep < 1:
+            raise ValueError("At least one snapshot must be kept.")
+        snapshots = self.snapshots()
+        removed = snapshots[: max(len(snapshots) - keep, 0)]
+        for name in removed:
+            (self.snapshots_dir / f"{name}.json").unlink()
+
+        used = {
+            entry["hash"]
+            for name in snapshots[len(removed) :]
+            for entry in self.read_snapshot(name).values()
+        }
+        if self.objects_dir.exists():
+            for path in self.objects_dir.iterdir():
+                if path.name not in used:
+                    path.unlink()
+        return len(removed)
+
+    def _write_object(self, digest: str, content: bytes) -> None:
+        path = self.objects_dir / digest
+        if path.exists():
+            return
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_bytes(zlib.compress(content))
+        os.replace(temp_path, path)
+
+    def _read_object(self, digest: str) -> bytes:
+        return zlib.decompress((self.objects_dir / digest).read_bytes())
+
+
+def _hashes(manifest: dict[str, dict]) -> dict[str, str]:
+    return {name: entry["hash"] for name, entry in manifest.items()}
+
+
+def _is_json(content: bytes) -> bool:
+    try:
+        json.loads(content)
+        return True
+    except ValueError:
+        return False
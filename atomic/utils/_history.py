@@ -0,0 +1,34 @@
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from ._logger import logger
+
+
+def month_start(path: Path) -> date | None:
+    """Return the first day of the month a data file belongs to, e.g. `Nov25.json`."""
+    try:
+        return datetime.strptime(path.stem, "%b%y").date()
+    except ValueError:
+        return None
+
+
+def month_files(profile_dir: Path) -> list[tuple[date, Path]]:
+    """List the month data files of a profile, oldest first."""
+    files = []
+    for path in profile_dir.glob("*.json"):
+        start = month_start(path)
+        if start is not None:
+            files.append((start, path))
+    return sorted(files)
+
+
+def read_month(path: Path) -> dict[str, dict[str, Any]]:
+    """Read a single month data file, returning an empty month on failure."""
+    try:
+        with path.open("r", encoding="utf-8") as file:
+            return json.load(file)
+    except Exception as e:
+        logger.error(e)
+        return {}
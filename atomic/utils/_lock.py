@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+from typing import IO
+
+LOCK_PATH = Path("atomic.lock")
+
+
+class AppLock:
+    """
+    Exclusive OS level lock on a file, held while the app runs or while a command rewrites the data folder.
+
+    The lock is released by the OS if the process dies, so a crash never leaves a stale lock behind.
+    """
+
+    def __init__(self, path: Path = LOCK_PATH) -> None:
+        self.path = path
+        self.file: IO[str] | None = None
+
+    def acquire(self) -> bool:
+        """Take the lock without waiting. Returns False if another process holds it."""
+        file = self.path.open("a+", encoding="utf-8")
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        self.file = file
+        return True
+
+    def release(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
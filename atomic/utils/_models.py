@@ -0,0 +1,179 @@
+import calendar
+import json
+from collections.abc import Sequence
+from datetime import date
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from ._history import month_start, read_month
+
+
+class Priority(Enum):
+    NONE = ""
+    LOW = "Low"
+    MEDIUM = "Medium"
+    HIGH = "High"
+
+    @classmethod
+    def _missing_(cls, value: object) -> "Priority":
+        return cls.NONE
+
+    @property
+    def weight(self) -> int:
+        """Experience/gold multiplier, habits without a priority count as `Low`."""
+        return {"Medium": 2, "High": 3}.get(self.value, 1)
+
+
+def day_of(column: str) -> int | None:
+    """Day number of a `Mon 1` style column label."""
+    try:
+        return int(column.split()[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+class Habit:
+    """
+    A habit row of one month. Marked days are kept as a bitmask, bit `n` for day `n`.
+    """
+
+    __slots__ = ("name", "priority", "marked")
+
+    def __init__(
+        self, name: str = "", priority: Priority = Priority.NONE, marked: int = 0
+    ) -> None:
+        self.name = name
+        self.priority = priority
+        self.marked = marked
+
+    @property
+    def key(self) -> str | None:
+        """Identifies a habit across months by its name. Unnamed rows have no history."""
+        return self.name.strip() or None
+
+    def is_marked(self, day: int) -> bool:
+        return bool(self.marked >> day & 1)
+
+    def mark(self, day: int, marked: bool = True) -> None:
+        if marked:
+            self.marked |= 1 << day
+        else:
+            self.marked &= ~(1 << day)
+
+    def marked_days(self) -> list[int]:
+        return [
+            day for day in range(1, self.marked.bit_length()) if self.is_marked(day)
+        ]
+
+    def count(self) -> int:
+        return self.marked.bit_count()
+
+    @classmethod
+    def from_cells(cls, cells: Sequence[Any]) -> "Habit":
+        """Read a tracker table row: name, priority and one cell per day."""
+        habit = cls(str(cells[0]), Priority(cells[1]))
+        for day, value in enumerate(cells[2:], start=1):
+            if value == "X":
+                habit.mark(day)
+        return habit
+
+    def to_cells(self, days: int) -> list[str]:
+        """Tracker table row for a month with `days` days."""
+        return [
+            self.name,
+            self.priority.value,
+            *("X" if self.is_marked(day) else "" for day in range(1, days + 1)),
+        ]
+
+
+class HabitMonth:
+    """
+    All habit rows of one month file.
+    """
+
+    __slots__ = ("start", "habits")
+
+    def __init__(self, start: date, habits: list[Habit] | None = None) -> None:
+        self.start = start
+        self.habits = habits if habits is not None else []
+
+    @property
+    def days(self) -> int:
+        return calendar.monthrange(self.start.year, self.start.month)[1]
+
+    def columns(self) -> list[str]:
+        """Column labels of the month, e.g. `Habit`, `Prio`, `Mon 1`, ..."""
+        return [
+            "Habit",
+            "Prio",
+            *(
+                f"{self.start.replace(day=day).strftime('%a')} {day}"
+                for day in range(1, self.days + 1)
+            ),
+        ]
+
+    def find(self, key: str) -> Habit | None:
+        return next((habit for habit in self.habits if habit.key == key), None)
+
+    def experience(self) -> int:
+        """Experience earned this month, one point per marked day times the priority weight."""
+        return sum(habit.priority.weight * habit.count() for habit in self.habits)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, Any]], start: date) -> "HabitMonth":
+        """Read the `{"1": {"Habit": ..., "Prio": ..., "Mon 1": "X", ...}}` file format."""
+        month = cls(start)
+        for row in data.values():
+            habit = Habit(str(row.get("Habit", "")), Priority(row.get("Prio", "")))
+            for column, value in row.items():
+                if value == "X" and (day := day_of(column)) is not None:
+                    habit.mark(day)
+            month.habits.append(habit)
+        return month
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        columns = self.columns()
+        return {
+            str(index): dict(zip(columns, habit.to_cells(self.days)))
+            for index, habit in enumerate(self.habits, start=1)
+        }
+
+    @classmethod
+    def load(cls, path: Path, start: date | None = None) -> "HabitMonth":
+        """Read a month file, taking the month from its `Nov25.json` style name unless given."""
+        start = start or month_start(path) or date.today().replace(day=1)
+        return cls.from_dict(read_month(path), start)
+
+    def save(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+class Profile:
+    """
+    Stats of a profile as stored in `profiles.json`.
+    """
+
+    __slots__ = ("name", "title", "level", "experience", "gold")
+
+    def __init__(
+        self, name: str, title: str, level: int = 1, experience: int = 0, gold: int = 0
+    ) -> None:
+        self.name = name
+        self.title = title
+        self.level = level
+        self.experience = experience
+        self.gold = gold
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict[str, Any]) -> "Profile":
+        return cls(name, data["title"], data["level"], data["experience"], data["gold"])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "title": self.title,
+            "level": self.level,
+            "experience": self.experience,
+            "gold": self.gold,
+        }
@@ -0,0 +1,186 @@
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+
+from ._history import month_files
+from ._logger import logger
+from ._models import HabitMonth
+
+STREAKS_FILE = "streaks.json"
+
+
+class HabitStreaks:
+    """
+    Completed days of one habit, stored as sorted, disjoint `[start, end]` segments of date ordinals.
+    """
+
+    __slots__ = ("starts", "ends", "longest")
+
+    def __init__(self) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.longest = 0
+
+    def __contains__(self, day: int) -> bool:
+        i = bisect_right(self.starts, day) - 1
+        return i >= 0 and self.ends[i] >= day
+
+    def add(self, day: int) -> None:
+        """Mark a day, merging it into the neighbouring segments."""
+        i = bisect_right(self.starts, day) - 1
+        if i >= 0 and self.ends[i] >= day:
+            return
+        joins_left = i >= 0 and self.ends[i] == day - 1
+        joins_right = i + 1 < len(self.starts) and self.starts[i + 1] == day + 1
+        if joins_left and joins_right:
+            self.ends[i] = self.ends[i + 1]
+            del self.starts[i + 1], self.ends[i + 1]
+        elif joins_left:
+            self.ends[i] = day
+        elif joins_right:
+            i += 1
+            self.starts[i] = day
+        else:
+            i += 1
+            self.starts.insert(i, day)
+            self.ends.insert(i, day)
+        self.longest = max(self.longest, self.ends[i] - self.starts[i] + 1)
+
+    def remove(self, day: int) -> None:
+        """Unmark a day, splitting its segment if needed."""
+        i = bisect_right(self.starts, day) - 1
+        if i < 0 or self.ends[i] < day:
+            return
+        start, end = self.starts[i], self.ends[i]
+        if start == end:
+            del self.starts[i], self.ends[i]
+        elif day == start:
+            self.starts[i] = day + 1
+        elif day == end:
+            self.ends[i] = day - 1
+        else:
+            self.ends[i] = day - 1
+            self.starts.insert(i + 1, day + 1)
+            self.ends.insert(i + 1, end)
+        # Only shrinking the longest segment can lower the record.
+        if end - start + 1 == self.longest:
+            self.longest = max(
+                (e - s + 1 for s, e in zip(self.starts, self.ends)), default=0
+            )
+
+    def current(self, today: int) -> int:
+        """Length of the streak running through today, or through yesterday if today isn't marked yet."""
+        i = bisect_right(self.starts, today) - 1
+        if i < 0 or self.ends[i] < today - 1:
+            return 0
+        return min(self.ends[i], today) - self.starts[i] + 1
+
+    def triples(self, first: int, last: int) -> int:
+        """Count three-day runs whose final day falls between `first` and `last`."""
+        count = 0
+        i = bisect_left(self.ends, first)
+        while i < len(self.starts) and self.starts[i] + 2 <= last:
+            count += max(
+                0, min(self.ends[i], last) - max(self.starts[i] + 2, first) + 1
+            )
+            i += 1
+        return count
+
+    def segments(self) -> list[tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
+
+
+class StreakIndex:
+    """
+    Streak index for every habit of a profile, covering its full history.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.habits: dict[str, HabitStreaks] = {}
+
+    @classmethod
+    def open(cls, profile_dir: Path) -> "StreakIndex":
+        """Load the profile's streak index, building it from the month files if missing."""
+        index = cls(profile_dir / STREAKS_FILE)
+        try:
+            with index.path.open("r", encoding="utf-8") as file:
+                saved = json.load(file)
+            for name, segments in saved["habits"].items():
+                streaks = index.habits[name] = HabitStreaks()
+                for start, end in segments:
+                    streaks.starts.append(date.fromisoformat(start).toordinal())
+                    streaks.ends.append(date.fromisoformat(end).toordinal())
+                streaks.longest = max(
+                    (e - s + 1 for s, e in streaks.segments()), default=0
+                )
+        except FileNotFoundError:
+            index.rebuild(profile_dir)
+            index.save()
+        except Exception as e:
+            logger.error(e)
+            index.rebuild(profile_dir)
+        return index
+
+    def rebuild(self, profile_dir: Path) -> None:
+        """Scan every month file of the profile once and rebuild all segments."""
+        days: dict[str, set[int]] = {}
+        for start, path in month_files(profile_dir):
+            month = HabitMonth.load(path, start)
+            for habit in month.habits:
+                if habit.key is None:
+                    continue
+                marked = days.setdefault(habit.key, set())
+                for day in habit.marked_days():
+                    if day <= month.days:
+                        marked.add(start.replace(day=day).toordinal())
+
+        self.habits = {}
+        for name, marked in days.items():
+            streaks = self.habits[name] = HabitStreaks()
+            for day in sorted(marked):
+                if streaks.ends and streaks.ends[-1] == day - 1:
+                    streaks.ends[-1] = day
+                else:
+                    streaks.starts.append(day)
+                    streaks.ends.append(day)
+            streaks.longest = max((e - s + 1 for s, e in streaks.segments()), default=0)
+        logger.info("Streak index rebuilt.")
+
+    def save(self) -> None:
+        saved = {
+            "habits": {
+                name: [
+                    [date.fromordinal(s).isoformat(), date.fromordinal(e).isoformat()]
+                    for s, e in streaks.segments()
+                ]
+                for name, streaks in self.habits.items()
+            }
+        }
+        try:
+            with self.path.open("w", encoding="utf-8") as file:
+                json.dump(saved, file, indent=4)
+        except Exception as e:
+            logger.error(e)
+
+    def mark(self, name: str | None, day: date, marked: bool) -> None:
+        """Apply a single toggled cell to the index."""
+        if name is None:
+            return
+        if marked:
+            self.habits.setdefault(name, HabitStreaks()).add(day.toordinal())
+        elif name in self.habits:
+            self.habits[name].remove(day.toordinal())
+
+    def current(self, name: str, today: date) -> int:
+        streaks = self.habits.get(name)
+        return streaks.current(today.toordinal()) if streaks else 0
+
+    def longest(self, name: str) -> int:
+        streaks = self.habits.get(name)
+        return streaks.longest if streaks else 0
+
+    def triples(self, name: str, first: date, last: date) -> int:
+        streaks = self.habits.get(name)
+        return streaks.triples(first.toordinal(), last.toordinal()) if streaks else 0
@@ -0,0 +1,327 @@
+import json
+import os
+import threading
+import urllib.request
+import uuid
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from ._history import month_files, month_start
+from ._logger import logger
+from ._models import Habit, HabitMonth, Priority, day_of
+from ._streaks import STREAKS_FILE, StreakIndex
+
+ROW = ""  # Column name of the register telling whether a habit row exists in a month.
+
+
+def _newer(change: list, current: list | None) -> bool:
+    """Last writer wins, ties broken by replica id. Registers are `[value, timestamp, replica, ...]`."""
+    return current is None or (change[1], change[2]) > (current[1], current[2])
+
+
+class SyncState:
+    """
+    Per-cell sync state of a profile, stored outside the data folder so that restoring a backup
+    of the month files shows up as local edits instead of being undone by the next pull.
+
+    Every habit-day cell (and the row itself) is a last-writer-wins register
+    `[value, timestamp, replica]` keyed by month and `habit<TAB>column`.
+    Local edits are found by comparing month files whose mtime changed with these registers;
+    the file mtime is used as the edit timestamp.
+    """
+
+    def __init__(self, profile_dir: Path, path: Path) -> None:
+        self.profile_dir = profile_dir
+        self.path = path
+        self.replica = uuid.uuid4().hex
+        self.server_seq = 0
+        self.mtimes: dict[str, int] = {}
+        self.cells: dict[str, dict[str, list]] = {}
+        self.pending: dict[str, list[str]] = {}
+
+    @classmethod
+    def open(cls, profile_dir: Path, path: Path) -> "SyncState":
+        state = cls(profile_dir, path)
+        try:
+            with state.path.open("r", encoding="utf-8") as file:
+                saved = json.load(file)
+            state.replica = saved["replica"]
+            state.server_seq = saved["server_seq"]
+            state.mtimes = saved["mtimes"]
+            state.cells = saved["cells"]
+            state.pending = saved["pending"]
+        except FileNotFoundError:
+            pass
+        return state
+
+    def save(self) -> None:
+        saved = {
+            "replica": self.replica,
+            "server_seq": self.server_seq,
+            "mtimes": self.mtimes,
+            "cells": self.cells,
+            "pending": self.pending,
+        }
+        os.makedirs(self.path.parent, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as file:
+            json.dump(saved, file)
+
+    def scan(self) -> None:
+        """Turn edits made to month files since the last scan into pending changes."""
+        for _, path in month_files(self.profile_dir):
+            mtime = path.stat().st_mtime_ns
+            if self.mtimes.get(path.stem) == mtime:
+                continue
+            month_cells = self.cells.setdefault(path.stem, {})
+            current = _month_cells(HabitMonth.load(path))
+            for key in month_cells.keys() - current.keys():
+                if month_cells[key][0] != "":
+                    current[key] = ""
+            pending = self.pending.setdefault(path.stem, [])
+            for key, value in current.items():
+                if key in month_cells and month_cells[key][0] == value:
+                    continue
+                month_cells[key] = [value, mtime, self.replica]
+                if key not in pending:
+                    pending.append(key)
+            self.mtimes[path.stem] = mtime
+
+    def outgoing(self) -> list[list]:
+        """Pending changes as `[month, key, value, timestamp, replica]`."""
+        return [
+            [month, key, *self.cells[month][key]]
+            for month, keys in self.pending.items()
+            for key in keys
+        ]
+
+    def apply(self, changes: list[list]) -> int:
+        """Merge remote changes into the registers and the month files. Returns the applied count."""
+        touched: dict[str, set[str]] = {}
+        applied = 0
+        for month, key, *register in changes:
+            month_cells = self.cells.setdefault(month, {})
+            if _newer(register, month_cells.get(key)):
+                month_cells[key] = register[:3]
+                touched.setdefault(month, set()).add(key.split("\t", 1)[0])
+                applied += 1
+
+        for month, names in touched.items():
+            path = self.profile_dir / f"{month}.json"
+            start = month_start(path)
+            if start is None:
+                continue
+            habit_month = HabitMonth.load(path, start)
+            habits = _month_habits(self.cells[month])
+            for name in names:
+                habit, current = habits.get(name), habit_month.find(name)
+                if habit is None:
+                    if current is not None:
+                        habit_month.habits.remove(current)
+                elif current is None:
+                    habit_month.habits.append(habit)
+                else:
+                    current.priority, current.marked = habit.priority, habit.marked
+            habit_month.save(path)
+            self.mtimes[month] = path.stat().st_mtime_ns
+        return applied
+
+
+def _month_habits(month_cells: dict[str, list]) -> dict[str, Habit]:
+    """
+    Habit rows of a month as its registers describe them, so every replica builds the same rows
+    whatever order the changes arrived in. A deleted row comes back if any of its cells was
+    written after the deletion.
+    """
+    rows: dict[str, dict[str, list]] = {}
+    for key, register in month_cells.items():
+        name, column = key.split("\t", 1)
+        rows.setdefault(name, {})[column] = register
+
+    habits = {}
+    for name, registers in rows.items():
+        row = registers.pop(ROW, None)
+        present = row is not None and row[0] != ""
+        if not present and not any(_newer(cell, row) for cell in registers.values()):
+            continue
+        habit = habits[name] = Habit(name)
+        for column, (value, *_) in registers.items():
+            if column == "Prio":
+                habit.priority = Priority(value)
+            elif value == "X" and (day := day_of(column)) is not None:
+                habit.mark(day)
+    return habits
+
+
+def _month_cells(month: HabitMonth) -> dict[str, str]:
+    """Non empty cells of a month, keyed by `habit<TAB>column`."""
+    cells = {}
+    columns = month.columns()
+    for habit in month.habits:
+        if habit.key is None:
+            continue
+        cells[f"{habit.key}\t{ROW}"] = "1"
+        if habit.priority is not Priority.NONE:
+            cells[f"{habit.key}\tPrio"] = habit.priority.value
+        for day in habit.marked_days():
+            if day <= month.days:
+                cells[f"{habit.key}\t{columns[day + 1]}"] = "X"
+    return cells
+
+
+def sync_profile(
+    profile_dir: Path, state_path: Path, server: str, profile: str
+) -> tuple[int, int]:
+    """
+    Push local cell changes to a sync server and pull the changes made elsewhere
+    since the last sync. Returns the number of pushed and pulled changes.
+    """
+    state = SyncState.open(profile_dir, state_path)
+    state.scan()
+    url = f"{server.rstrip('/')}/changes/{quote(profile)}"
+
+    outgoing = state.outgoing()
+    if outgoing:
+        _request(url, {"changes": outgoing})
+    state.pending = {}
+
+    response = _request(f"{url}?since={state.server_seq}")
+    pulled = state.apply(response["changes"])
+    state.server_seq = response["seq"]
+    state.save()
+    if pulled:
+        streak_index = StreakIndex(profile_dir / STREAKS_FILE)
+        streak_index.rebuild(profile_dir)
+        streak_index.save()
+    logger.info(f"Synced profile {profile}: {len(outgoing)} pushed, {pulled} pulled.")
+    return len(outgoing), pulled
+
+
+def _request(url: str, payload: dict | None = None) -> dict:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+class SyncServer(ThreadingHTTPServer):
+    """
+    Reference sync server keeping the last-writer-wins registers of every profile.
+
+    `POST /changes/<profile>` merges a batch of changes, `GET /changes/<profile>?since=<seq>`
+    returns the registers changed after a sequence number. State is kept in a single JSON file.
+    """
+
+    def __init__(self, address: tuple[str, int], store: Path) -> None:
+        super().__init__(address, SyncRequestHandler)
+        self.store = store
+        self.lock = threading.Lock()
+        self.profiles: dict[str, dict] = {}
+        if store.exists():
+            with store.open("r", encoding="utf-8") as file:
+                self.profiles = json.load(file)
+        # Sequence numbers of accepted changes, in order, for cheap `since` lookups.
+        self.logs = {
+            profile: sorted(
+                (register[3], month, key)
+                for month, cells in state["cells"].items()
+                for key, register in cells.items()
+            )
+            for profile, state in self.profiles.items()
+        }
+
+    def push(self, profile: str, changes: list[list]) -> int:
+        """Merge a batch of changes. The whole batch is rejected with `ValueError` if any change is malformed."""
+        if not isinstance(changes, list) or not all(map(_is_change, changes)):
+            raise ValueError("malformed change")
+        with self.lock:
+            state = self.profiles.setdefault(profile, {"seq": 0, "cells": {}})
+            log = self.logs.setdefault(profile, [])
+            for month, key, *register in changes:
+                month_cells = state["cells"].setdefault(month, {})
+                if _newer(register, month_cells.get(key)):
+                    state["seq"] += 1
+                    month_cells[key] = [*register[:3], state["seq"]]
+                    log.append((state["seq"], month, key))
+            with self.store.open("w", encoding="utf-8") as file:
+                json.dump(self.profiles, file)
+            return state["seq"]
+
+    def pull(self, profile: str, since: int) -> dict:
+        with self.lock:
+            state = self.profiles.get(profile, {"seq": 0, "cells": {}})
+            log = self.logs.get(profile, [])
+            changes = []
+            for seq, month, key in log[
+                bisect_right(log, since, key=lambda entry: entry[0]) :
+            ]:
+                register = state["cells"][month][key]
+                # Skip log entries that a later change of the same cell superseded.
+                if register[3] == seq:
+                    changes.append([month, key, *register[:3]])
+            return {"seq": state["seq"], "changes": changes}
+
+
+def _is_change(change: Any) -> bool:
+    """Check a change has the `[month, key, value, timestamp, replica]` shape."""
+    return (
+        isinstance(change, list)
+        and len(change) == 5
+        and isinstance(change[0], str)
+        and isinstance(change[1], str)
+        and "\t" in change[1]
+        and isinstance(change[2], str)
+        and type(change[3]) is int
+        and isinstance(change[4], str)
+    )
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    server: SyncServer
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        profile = self._profile(url.path)
+        if profile is None:
+            return
+        try:
+            since = int(parse_qs(url.query).get("since", ["0"])[0])
+        except ValueError:
+            self._reply(400, {"error": "invalid since"})
+            return
+        self._reply(200, self.server.pull(profile, since))
+
+    def do_POST(self) -> None:
+        profile = self._profile(urlparse(self.path).path)
+        if profile is None:
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            changes = json.loads(self.rfile.read(length))["changes"]
+            seq = self.server.push(profile, changes)
+        except (ValueError, KeyError, TypeError):
+            self._reply(400, {"error": "invalid payload"})
+            return
+        self._reply(200, {"seq": seq})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(format % args)
+
+    def _profile(self, path: str) -> str | None:
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "changes" or not parts[1]:
+            self._reply(404, {"error": "not found"})
+            return None
+        return unquote(parts[1])
+
+    def _reply(self, status: int, body: dict) -> None:
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
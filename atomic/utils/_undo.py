@@ -0,0 +1,66 @@
+from collections import deque
+from typing import Any
+
+
+class CellEdit:
+    """
+    A single cell change of the tracker table.
+    """
+
+    __slots__ = ("row", "column", "before", "after")
+
+    def __init__(self, row: int, column: int, before: Any, after: Any) -> None:
+        self.row = row
+        self.column = column
+        self.before = before
+        self.after = after
+
+    def inverse(self) -> "CellEdit":
+        return CellEdit(self.row, self.column, self.after, self.before)
+
+
+class RowEdit:
+    """
+    A row inserted into or removed from the tracker table, with its contents.
+    """
+
+    __slots__ = ("row", "values", "inserted")
+
+    def __init__(self, row: int, values: list[Any], inserted: bool) -> None:
+        self.row = row
+        self.values = values
+        self.inserted = inserted
+
+    def inverse(self) -> "RowEdit":
+        return RowEdit(self.row, self.values, not self.inserted)
+
+
+class UndoLog:
+    """
+    Undo/redo stacks of table edits, keeping at most `limit` undo steps.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.undo_stack: deque[CellEdit | RowEdit] = deque(maxlen=limit)
+        self.redo_stack: list[CellEdit | RowEdit] = []
+
+    def record(self, edit: CellEdit | RowEdit) -> None:
+        """Store a new edit. Any redo history is dropped."""
+        self.undo_stack.append(edit)
+        self.redo_stack.clear()
+
+    def undo(self) -> CellEdit | RowEdit | None:
+        """Return the edit that reverts the latest change, if any."""
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        self.redo_stack.append(edit)
+        return edit.inverse()
+
+    def redo(self) -> CellEdit | RowEdit | None:
+        """Return the latest undone edit so it can be applied again, if any."""
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        self.undo_stack.append(edit)
+        return edit
@@ -2,7 +2,7 @@ import json
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from ._logger import logger
 
@@ -11,6 +11,9 @@ class ConfigValidation(BaseModel):
     colors: dict
     titles: list
     experience: list
+    undo_limit: int = Field(default=100, ge=0)
+    backup_interval: int = Field(default=60, ge=0)
+    backup_keep: int = Field(default=48, ge=1)
 
 
 def _read_json_file() -> Any | None:
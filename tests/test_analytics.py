@@ -0,0 +1,97 @@
+from datetime import date
+
+import pytest
+
+from atomic.utils import _analytics
+from atomic.utils._analytics import HistoryMatrix
+from atomic.utils._models import Habit, HabitMonth, Priority
+
+
+@pytest.fixture(autouse=True)
+def today(monkeypatch):
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return cls(2024, 3, 10)
+
+    monkeypatch.setattr(_analytics, "date", Today)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(_analytics, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def profile(tmp_path):
+    february = HabitMonth(date(2024, 2, 1), [Habit("Read", Priority.HIGH)])
+    february.habits[0].mark(28)
+    february.habits[0].mark(29)
+    february.save(tmp_path / "Feb24.json")
+    # Every day of March is marked, including the days after today.
+    march = HabitMonth(
+        date(2024, 3, 1),
+        [Habit("Read", Priority.HIGH, marked=(1 << 32) - 2), Habit("Walk")],
+    )
+    march.habits[1].mark(1)
+    march.habits[1].mark(2)
+    march.save(tmp_path / "Mar24.json")
+    return tmp_path
+
+
+def summary(matrix: HistoryMatrix) -> tuple:
+    return (
+        matrix.habit_rates(),
+        matrix.weekday_rates(),
+        matrix.priority_rates(),
+        matrix.daily_counts(),
+    )
+
+
+def test_rates_ignore_days_after_today(profile, backend):
+    matrix = HistoryMatrix.load(profile, 2024)
+    # Read is tracked from Feb 1 to Mar 10 and done on Feb 28, 29 and Mar 1-10.
+    assert matrix.habit_rates() == {"Read": 12 / 39, "Walk": 2 / 10}
+    assert matrix.priority_rates() == {"Low": 2 / 10, "Medium": 0.0, "High": 12 / 39}
+    assert all(rate <= 1 for rate in matrix.weekday_rates().values())
+
+
+def test_leap_year_has_february_29(profile, backend):
+    matrix = HistoryMatrix.load(profile, 2024)
+    assert matrix.days == 366
+    counts = dict(matrix.daily_counts())
+    assert counts[date(2024, 2, 29)] == 1
+    assert counts[date(2024, 3, 1)] == 2
+    assert counts[date(2024, 3, 10)] == 1
+    assert counts[date(2024, 3, 11)] == 0
+
+
+def test_full_history_spans_all_month_files(profile, backend):
+    matrix = HistoryMatrix.load(profile)
+    assert matrix.first_day == date(2024, 2, 1)
+    assert matrix.days == 29 + 31
+    assert matrix.habit_rates() == {"Read": 12 / 39, "Walk": 2 / 10}
+
+
+def test_empty_profile(tmp_path, backend):
+    matrix = HistoryMatrix.load(tmp_path)
+    assert matrix.days == 1
+    assert matrix.habit_rates() == {}
+    assert set(matrix.weekday_rates().values()) == {0.0}
+    assert matrix.priority_rates() == {"Low": 0.0, "Medium": 0.0, "High": 0.0}
+    assert matrix.daily_counts() == [(date(2024, 3, 10), 0)]
+
+    matrix = HistoryMatrix.load(tmp_path, 2023)
+    assert matrix.days == 365
+    assert sum(count for _, count in matrix.daily_counts()) == 0
+
+
+def test_numpy_and_python_agree(profile, monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = summary(HistoryMatrix.load(profile, 2024))
+    monkeypatch.setattr(_analytics, "np", None)
+    assert summary(HistoryMatrix.load(profile, 2024)) == with_numpy
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import pytest
+
+from atomic.utils import _backup
+from atomic.utils._backup import BackupStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Backup store whose snapshots are named one day apart, starting 2026-10-01 10:00."""
+    times = iter(datetime(2026, 10, day, 10) for day in range(1, 32))
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(times)
+
+    monkeypatch.setattr(_backup, "datetime", Clock)
+    (tmp_path / "data").mkdir()
+    return BackupStore(tmp_path / "data", tmp_path / "backups")
+
+
+def write(store: BackupStore, name: str, text: str) -> None:
+    path = store.data_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_create_stores_identical_content_once(store):
+    write(store, "Alice/Oct26.json", '{"1": {"Habit": "Read"}}')
+    write(store, "Bob/Oct26.json", '{"1": {"Habit": "Read"}}')
+    write(store, "profiles.json", '{"current": "Alice"}')
+
+    assert store.create() == "20261001-100000"
+    assert len(list(store.objects_dir.iterdir())) == 2
+    manifest = store.read_snapshot("20261001-100000")
+    assert manifest["Alice/Oct26.json"]["hash"] == manifest["Bob/Oct26.json"]["hash"]
+
+
+def test_create_is_a_no_op_without_changes(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    assert store.create() == "20261001-100000"
+    assert store.create() is None
+    assert store.snapshots() == ["20261001-100000"]
+
+    write(store, "profiles.json", '{"current": "Bob"}')
+    assert store.create() == "20261002-100000"
+
+
+def test_create_skips_half_written_json(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    store.create()
+    write(store, "profiles.json", '{"current": ')
+    assert store.create() is None
+
+
+def test_restore_to_partial_timestamp(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    store.create()
+    write(store, "profiles.json", '{"current": "Bob"}')
+    store.create()
+    write(store, "profiles.json", '{"current": "Carol"}')
+    write(store, "Carol/Oct26.json", "{}")
+    store.create()
+    write(store, "profiles.json", '{"current": "Dave"}')
+
+    assert store.restore("20261002") == "20261002-100000"
+    assert (store.data_dir / "profiles.json").read_text() == '{"current": "Bob"}'
+    assert not (store.data_dir / "Carol/Oct26.json").exists()
+    # The state before the restore was snapshotted first.
+    assert store.snapshots()[-1] == "20261004-100000"
+    assert store.restore("2025") is None
+
+
+def test_prune_removes_unused_objects(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    store.create()
+    old_hash = store.read_snapshot("20261001-100000")["profiles.json"]["hash"]
+    write(store, "profiles.json", '{"current": "Bob"}')
+    write(store, "Bob/Oct26.json", "{}")
+    store.create()
+
+    assert store.prune(1) == 1
+    assert store.snapshots() == ["20261002-100000"]
+    remaining = {path.name for path in store.objects_dir.iterdir()}
+    assert old_hash not in remaining
+    assert remaining == {
+        entry["hash"] for entry in store.read_snapshot("20261002-100000").values()
+    }
+    assert store.prune(1) == 0
+
+
+def test_restore_rejects_malformed_point(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    store.create()
+    for point in ("latest", "x", "2026-10", "20261001-1000000", ""):
+        with pytest.raises(ValueError):
+            store.restore(point)
+
+
+def test_restore_leaves_files_alone_if_an_object_is_missing(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    write(store, "Alice/Oct26.json", "{}")
+    store.create()
+    manifest = store.read_snapshot("20261001-100000")
+    (store.objects_dir / manifest["Alice/Oct26.json"]["hash"]).unlink()
+    write(store, "profiles.json", '{"current": "Bob"}')
+
+    with pytest.raises(FileNotFoundError):
+        store.restore("20261001")
+    assert (store.data_dir / "profiles.json").read_text() == '{"current": "Bob"}'
+
+
+def test_prune_keeps_at_least_one_snapshot(store):
+    write(store, "profiles.json", '{"current": "Alice"}')
+    store.create()
+    for keep in (0, -1):
+        with pytest.raises(ValueError):
+            store.prune(keep)
+    assert store.snapshots() == ["20261001-100000"]
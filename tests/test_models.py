@@ -0,0 +1,94 @@
+from datetime import date
+
+from atomic.utils._models import Habit, HabitMonth, Priority, Profile, day_of
+
+OCTOBER = date(2025, 10, 1)
+
+
+def month_file(rows: list[tuple[str, str, set[int]]]) -> dict[str, dict[str, str]]:
+    """A month file as the app wrote it before the domain model existed."""
+    return {
+        str(index): {
+            "Habit": name,
+            "Prio": prio,
+            **{
+                f"{OCTOBER.replace(day=day).strftime('%a')} {day}": "X"
+                if day in marked
+                else ""
+                for day in range(1, 32)
+            },
+        }
+        for index, (name, prio, marked) in enumerate(rows, start=1)
+    }
+
+
+def test_priority_falls_back_to_none():
+    assert Priority("High") is Priority.HIGH
+    assert Priority("") is Priority.NONE
+    assert Priority("Urgent") is Priority.NONE
+    assert [prio.weight for prio in Priority] == [1, 1, 2, 3]
+
+
+def test_month_file_round_trip():
+    data = month_file(
+        [("Read", "High", {1, 2, 31}), ("", "", set()), ("Walk", "", {5})]
+    )
+    month = HabitMonth.from_dict(data, OCTOBER)
+    assert [habit.name for habit in month.habits] == ["Read", "", "Walk"]
+    assert month.habits[0].marked_days() == [1, 2, 31]
+    assert month.habits[1].key is None
+    assert month.to_dict() == data
+
+
+def test_day_columns_are_matched_by_label():
+    row = {"Sun 5": "X", "Prio": "Medium", "Wed 1": "X", "Habit": "Read", "Bonus": "X"}
+    habit = HabitMonth.from_dict({"1": row}, OCTOBER).habits[0]
+    assert habit.priority is Priority.MEDIUM
+    assert habit.marked_days() == [1, 5]
+    assert day_of("Fri 31") == 31
+    assert day_of("Prio") is None
+
+
+def test_missing_columns_use_defaults():
+    habit = HabitMonth.from_dict({"1": {}}, OCTOBER).habits[0]
+    assert (habit.name, habit.priority, habit.marked) == ("", Priority.NONE, 0)
+
+
+def test_experience_uses_priority_not_name():
+    month = HabitMonth(
+        OCTOBER,
+        [
+            Habit("High", Priority.NONE, marked=0b110),
+            Habit("Low", Priority.HIGH, marked=0b10),
+            Habit("Medium", Priority.MEDIUM, marked=0b1110),
+        ],
+    )
+    assert month.experience() == 2 * 1 + 1 * 3 + 3 * 2
+
+
+def test_table_cells_round_trip():
+    habit = Habit("Read", Priority.LOW)
+    habit.mark(3)
+    cells = habit.to_cells(30)
+    assert cells[:5] == ["Read", "Low", "", "", "X"]
+    assert len(cells) == 32
+    restored = Habit.from_cells(cells)
+    assert (restored.name, restored.priority, restored.marked) == (
+        "Read",
+        Priority.LOW,
+        habit.marked,
+    )
+
+
+def test_save_and_load(tmp_path):
+    month = HabitMonth(OCTOBER, [Habit("Read", Priority.HIGH, marked=0b10)])
+    month.save(tmp_path / "Oct25.json")
+    loaded = HabitMonth.load(tmp_path / "Oct25.json")
+    assert loaded.start == OCTOBER
+    assert loaded.days == 31
+    assert loaded.find("Read").marked_days() == [1]
+
+
+def test_profile_round_trip():
+    data = {"title": "Novice", "level": 2, "experience": 40, "gold": 15}
+    assert Profile.from_dict("alice", data).to_dict() == data
@@ -0,0 +1,99 @@
+from datetime import date
+
+from atomic.utils._models import Habit, HabitMonth, Priority
+from atomic.utils._streaks import HabitStreaks, StreakIndex
+
+
+def ordinal(year: int, month: int, day: int) -> int:
+    return date(year, month, day).toordinal()
+
+
+def test_add_merges_neighbouring_segments():
+    streaks = HabitStreaks()
+    for day in (1, 2, 4, 5, 3):
+        streaks.add(day)
+    assert streaks.segments() == [(1, 5)]
+    assert streaks.longest == 5
+
+
+def test_add_is_idempotent():
+    streaks = HabitStreaks()
+    streaks.add(3)
+    streaks.add(3)
+    assert streaks.segments() == [(3, 3)]
+    assert streaks.longest == 1
+
+
+def test_remove_splits_segment_and_lowers_longest():
+    streaks = HabitStreaks()
+    for day in range(1, 8):
+        streaks.add(day)
+    streaks.remove(4)
+    assert streaks.segments() == [(1, 3), (5, 7)]
+    assert streaks.longest == 3
+
+    streaks.remove(1)
+    streaks.remove(7)
+    assert streaks.segments() == [(2, 3), (5, 6)]
+    assert streaks.longest == 2
+
+    streaks.remove(10)
+    assert streaks.segments() == [(2, 3), (5, 6)]
+
+
+def test_current_runs_through_today_or_yesterday():
+    streaks = HabitStreaks()
+    for day in (3, 4, 5, 9):
+        streaks.add(day)
+    assert streaks.current(5) == 3
+    assert streaks.current(6) == 3
+    assert streaks.current(7) == 0
+    assert streaks.current(10) == 1
+    # Marked days in the future don't count yet.
+    assert streaks.current(4) == 2
+
+
+def test_triples_counts_runs_ending_in_range():
+    streaks = HabitStreaks()
+    for day in range(1, 6):
+        streaks.add(day)
+    assert streaks.triples(1, 31) == 3
+    assert streaks.triples(4, 31) == 2
+    assert streaks.triples(1, 3) == 1
+    assert streaks.triples(6, 31) == 0
+
+
+def test_streak_crosses_month_boundary(tmp_path):
+    september = HabitMonth(date(2026, 9, 1), [Habit("Read", Priority.HIGH)])
+    september.habits[0].mark(29)
+    september.habits[0].mark(30)
+    september.save(tmp_path / "Sep26.json")
+    october = HabitMonth(date(2026, 10, 1), [Habit("Read", Priority.HIGH)])
+    october.habits[0].mark(1)
+    october.save(tmp_path / "Oct26.json")
+
+    index = StreakIndex.open(tmp_path)
+    assert index.habits["Read"].segments() == [
+        (ordinal(2026, 9, 29), ordinal(2026, 10, 1))
+    ]
+    assert index.longest("Read") == 3
+    assert index.current("Read", date(2026, 10, 2)) == 3
+    assert index.triples("Read", date(2026, 10, 1), date(2026, 10, 31)) == 1
+    assert index.triples("Read", date(2026, 9, 1), date(2026, 9, 30)) == 0
+
+
+def test_index_is_saved_and_updated_incrementally(tmp_path):
+    index = StreakIndex.open(tmp_path)
+    assert index.habits == {}
+    index.mark("Read", date(2026, 10, 31), True)
+    index.mark("Read", date(2026, 11, 1), True)
+    index.mark(None, date(2026, 11, 2), True)
+    index.save()
+
+    reloaded = StreakIndex.open(tmp_path)
+    assert reloaded.longest("Read") == 2
+    reloaded.mark("Read", date(2026, 10, 31), False)
+    assert reloaded.habits["Read"].segments() == [
+        (ordinal(2026, 11, 1), ordinal(2026, 11, 1))
+    ]
+    assert reloaded.longest("Read") == 1
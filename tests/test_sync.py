@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from atomic.utils._models import Habit, HabitMonth
+from atomic.utils._streaks import StreakIndex
+from atomic.utils._sync import SyncServer, sync_profile
+
+OCTOBER = date(2026, 10, 1)
+clock = iter(range(time.time_ns() + 10**9, time.time_ns() + 10**12, 10**9))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = SyncServer(("127.0.0.1", 0), tmp_path / "store.json")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def state(profile_dir: Path) -> Path:
+    return profile_dir.parent / "sync" / f"{profile_dir.name}.json"
+
+
+def url(server: SyncServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def edit(profile_dir, change) -> None:
+    """Edit the October file of a replica with a distinct, increasing mtime."""
+    path = profile_dir / "Oct26.json"
+    month = HabitMonth.load(path, OCTOBER)
+    change(month)
+    month.save(path)
+    mtime = next(clock)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def marked(profile_dir) -> dict[str, list[int]]:
+    month = HabitMonth.load(profile_dir / "Oct26.json", OCTOBER)
+    return {habit.name: habit.marked_days() for habit in month.habits}
+
+
+def test_independent_edits_and_row_deletion(tmp_path, server):
+    laptop, desktop = tmp_path / "laptop", tmp_path / "desktop"
+    laptop.mkdir()
+    desktop.mkdir()
+
+    def create(month):
+        month.habits = [Habit("Read"), Habit("Write")]
+        month.habits[0].mark(1)
+
+    edit(laptop, create)
+    assert sync_profile(laptop, state(laptop), url(server), "Alice") == (3, 0)
+    sync_profile(desktop, state(desktop), url(server), "Alice")
+    assert marked(desktop) == {"Read": [1], "Write": []}
+
+    edit(laptop, lambda month: month.find("Read").mark(2))
+    edit(desktop, lambda month: month.find("Write").mark(3))
+    sync_profile(laptop, state(laptop), url(server), "Alice")
+    sync_profile(desktop, state(desktop), url(server), "Alice")
+    sync_profile(laptop, state(laptop), url(server), "Alice")
+    assert marked(laptop) == marked(desktop) == {"Read": [1, 2], "Write": [3]}
+    assert StreakIndex.open(laptop).longest("Read") == 2
+
+    edit(desktop, lambda month: month.habits.remove(month.find("Write")))
+    sync_profile(desktop, state(desktop), url(server), "Alice")
+    assert sync_profile(laptop, state(laptop), url(server), "Alice") == (0, 2)
+    assert marked(laptop) == {"Read": [1, 2]}
+    # Nothing left to exchange once both replicas agree.
+    assert sync_profile(desktop, state(desktop), url(server), "Alice") == (0, 0)
+
+
+def test_restored_month_file_wins_over_the_server(tmp_path, server):
+    laptop, desktop = tmp_path / "laptop", tmp_path / "desktop"
+    laptop.mkdir()
+    desktop.mkdir()
+
+    def create(month):
+        month.habits = [Habit("Read")]
+        month.habits[0].mark(1)
+
+    edit(laptop, create)
+    sync_profile(laptop, state(laptop), url(server), "Alice")
+    backup = (laptop / "Oct26.json").read_bytes()
+    edit(laptop, lambda month: month.find("Read").mark(2))
+    sync_profile(laptop, state(laptop), url(server), "Alice")
+
+    # Restoring a backup only rewrites the data folder, the sync state is kept.
+    (laptop / "Oct26.json").write_bytes(backup)
+    mtime = next(clock)
+    os.utime(laptop / "Oct26.json", ns=(mtime, mtime))
+    assert sync_profile(laptop, state(laptop), url(server), "Alice") == (1, 0)
+    sync_profile(desktop, state(desktop), url(server), "Alice")
+    assert marked(laptop) == marked(desktop) == {"Read": [1]}
+
+
+@pytest.mark.parametrize("deleted_last", [True, False])
+def test_deleted_row_and_concurrent_edit_converge(tmp_path, server, deleted_last):
+    laptop, desktop = tmp_path / "laptop", tmp_path / "desktop"
+    laptop.mkdir()
+    desktop.mkdir()
+
+    def create(month):
+        month.habits = [Habit("Read")]
+        month.habits[0].mark(1)
+
+    edit(laptop, create)
+    sync_profile(laptop, state(laptop), url(server), "Alice")
+    sync_profile(desktop, state(desktop), url(server), "Alice")
+
+    def delete():
+        edit(laptop, lambda month: month.habits.clear())
+
+    def mark():
+        edit(desktop, lambda month: month.find("Read").mark(2))
+
+    if deleted_last:
+        mark()
+        delete()
+    else:
+        delete()
+        mark()
+    for _ in range(3):
+        sync_profile(laptop, state(laptop), url(server), "Alice")
+        sync_profile(desktop, state(desktop), url(server), "Alice")
+
+    # The later write wins: either the row stays deleted, or the edit brings it back
+    # without the days the deletion cleared.
+    expected = {} if deleted_last else {"Read": [2]}
+    assert marked(laptop) == marked(desktop) == expected
+
+
+def test_pull_returns_changes_after_since(server):
+    server.push(
+        "Alice",
+        [
+            ["Oct26", "Read\t", "1", 10, "a"],
+            ["Oct26", "Read\tThu 1", "X", 10, "a"],
+        ],
+    )
+    seq = server.push("Alice", [["Oct26", "Read\tThu 1", "", 20, "b"]])
+    assert seq == 3
+    # Older writes lose against the register already stored.
+    assert server.push("Alice", [["Oct26", "Read\tThu 1", "X", 15, "c"]]) == 3
+
+    assert server.pull("Alice", 0) == {
+        "seq": 3,
+        "changes": [
+            ["Oct26", "Read\t", "1", 10, "a"],
+            ["Oct26", "Read\tThu 1", "", 20, "b"],
+        ],
+    }
+    assert server.pull("Alice", 2)["changes"] == [["Oct26", "Read\tThu 1", "", 20, "b"]]
+    assert server.pull("Alice", 3)["changes"] == []
+    assert server.pull("Bob", 0) == {"seq": 0, "changes": []}
+
+
+def test_push_rejects_malformed_batch_as_a_whole(server):
+    with pytest.raises(ValueError):
+        server.push(
+            "Alice",
+            [["Oct26", "Read\t", "1", 10, "a"], ["Oct26", "Read", "1", 10, "a"]],
+        )
+    assert server.pull("Alice", 0) == {"seq": 0, "changes": []}
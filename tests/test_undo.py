@@ -0,0 +1,52 @@
+from atomic.utils._undo import CellEdit, RowEdit, UndoLog
+
+
+def test_cell_edit_inverse_swaps_values():
+    edit = CellEdit(2, 5, "", "X").inverse()
+    assert (edit.row, edit.column, edit.before, edit.after) == (2, 5, "X", "")
+
+
+def test_row_edit_inverse_flips_insertion():
+    values = ["Read", "High", "X"]
+    edit = RowEdit(1, values, inserted=False).inverse()
+    assert (edit.row, edit.values, edit.inserted) == (1, values, True)
+    assert edit.inverse().inserted is False
+
+
+def test_undo_and_redo():
+    log = UndoLog(10)
+    assert log.undo() is None
+    assert log.redo() is None
+
+    log.record(CellEdit(0, 2, "", "X"))
+    undo = log.undo()
+    assert (undo.before, undo.after) == ("X", "")
+    redo = log.redo()
+    assert (redo.before, redo.after) == ("", "X")
+    assert log.redo() is None
+
+
+def test_record_clears_redo():
+    log = UndoLog(10)
+    log.record(CellEdit(0, 2, "", "X"))
+    log.undo()
+    log.record(CellEdit(0, 3, "", "X"))
+    assert log.redo() is None
+    assert log.undo().column == 3
+    assert log.undo() is None
+
+
+def test_limit_drops_oldest_edit():
+    log = UndoLog(2)
+    for column in (2, 3, 4):
+        log.record(CellEdit(0, column, "", "X"))
+    assert log.undo().column == 4
+    assert log.undo().column == 3
+    assert log.undo() is None
+
+
+def test_zero_limit_keeps_no_history():
+    log = UndoLog(0)
+    log.record(CellEdit(0, 2, "", "X"))
+    assert log.undo() is None
+    assert log.redo() is None